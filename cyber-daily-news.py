@@ -20,26 +20,35 @@ Important:
 
 import os
 import re
-import io
 import html
-import math
+import json
 import time
+import bisect
 import calendar
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from difflib import SequenceMatcher
 from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, List, Tuple
 
 import feedparser
+import jellyfish
+import numpy as np
 import pytz
 import requests
+from datasketch import MinHash, MinHashLSH
+from requests.adapters import HTTPAdapter
 
+from reportlab import rl_config
 from reportlab.lib.pagesizes import LETTER, landscape
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.utils import simpleSplit
 
+# Skip reportlab's per-call shape validation; we only draw rects/text/lines.
+rl_config.shapeChecking = 0
+
 
 # ================= CONFIG ================= #
 
@@ -105,11 +114,24 @@ TOP_N = int(os.getenv("TOP_N", "10"))
 LOOKBACK_HOURS = int(os.getenv("LOOKBACK_HOURS", "72"))
 SUMMARY_MAX_CHARS = int(os.getenv("SUMMARY_MAX_CHARS", "240"))
 MAX_KEYWORD_SCORE = int(os.getenv("MAX_KEYWORD_SCORE", "80"))
-DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.93"))
+# Jaro cutoff for confirming near-duplicate titles. Calibrated for that
+# metric, which scores lower than the SequenceMatcher-style ratio the old
+# 0.93 default was tuned for: headline variants the ratio dedup caught land
+# around 0.88-0.99 Jaro on normalized titles, while distinct stories sharing
+# much of their wording stay at or below ~0.85.
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.86"))
+MINHASH_PERMS = int(os.getenv("MINHASH_PERMS", "64"))
+# Loose Jaccard gate for LSH candidate generation only. Shingle Jaccard is a
+# much stricter metric than a string-similarity ratio at the same value
+# (near-duplicate headlines often sit near 0.8 Jaccard), and MinHash adds
+# variance on top, so the gate stays well below DUPLICATE_THRESHOLD, which
+# applies in the confirmation pass.
+LSH_CANDIDATE_THRESHOLD = float(os.getenv("LSH_CANDIDATE_THRESHOLD", "0.5"))
 SHOW_SIGNALS = os.getenv("SHOW_SIGNALS", "1").strip().lower() not in {"0", "false", "no"}
 OUT_DIR = os.getenv("OUT_DIR", "out")
 
 MAX_URL_LINES = int(os.getenv("MAX_URL_LINES", "2"))
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))
 
 # Optional send (NO twilio SDK)
 SEND_WHATSAPP_TEXT = os.getenv("SEND_WHATSAPP_TEXT", "0").strip().lower() in {"1", "true", "yes"}
@@ -126,6 +148,22 @@ PUBLIC_PATH_PREFIX = os.getenv("PUBLIC_PATH_PREFIX", "")
 _WORD_BOUNDARY_TOKENS = {"apt", "cve", "rce"}
 
 
+def _keyword_branch(kw: str) -> str:
+    esc = re.escape(kw)
+    if kw in _WORD_BOUNDARY_TOKENS or len(kw) <= 3:
+        return rf"\b{esc}\b"
+    return esc
+
+
+# Compiled once at import: one combined alternation (longest keywords first)
+# so scoring scans each text once.
+_KW_ANY = re.compile("|".join(
+    _keyword_branch(kw) for kw in sorted(KEYWORD_WEIGHTS, key=len, reverse=True)
+))
+# Heaviest keywords first so scoring can stop as soon as the cap is reached.
+_KW_SORTED = sorted(KEYWORD_WEIGHTS.items(), key=lambda kv: kv[1], reverse=True)
+
+
 # ================= VISUAL THEME ================= #
 
 BLUE_050 = colors.Color(0.94, 0.97, 1.00)
@@ -153,20 +191,33 @@ def safe_text(s: str) -> str:
     return html.unescape(s or "").strip()
 
 
+_LINK_TRACKING_RE = re.compile(r"[?&](?:utm_[^=&]+|ref)=[^&]+")
+
+
 def canonical_link(link: str) -> str:
     link = (link or "").strip()
-    link = re.sub(r"#.*$", "", link)
-    link = re.sub(r"[?&]utm_[^=&]+=[^&]+", "", link)
-    link = re.sub(r"[?&]ref=[^&]+", "", link)
-    link = re.sub(r"\?$", "", link)
+    # Most links are already clean; the str membership tests keep them off
+    # the regex path entirely.
+    if "#" in link:
+        link = link.split("#", 1)[0]
+    if "?" in link or "&" in link:
+        link = _LINK_TRACKING_RE.sub("", link)
+        if link.endswith("?"):
+            link = link[:-1]
     return link
 
 
-def token_present(text: str, token: str) -> bool:
-    t = token.lower().strip()
-    if t in _WORD_BOUNDARY_TOKENS or len(t) <= 3:
-        return re.search(rf"\b{re.escape(t)}\b", text) is not None
-    return t in text
+def keyword_hits(text: str) -> List[str]:
+    """One combined-regex pass over the text, returning matched keywords in
+    KEYWORD_WEIGHTS order. A keyword contained in a longer match still counts
+    (e.g. "breach" inside "data breach"), preserving the old per-keyword
+    substring-and-boundary semantics.
+    """
+    matched = set(_KW_ANY.findall(text))
+    if not matched:
+        return []
+    return [kw for kw in KEYWORD_WEIGHTS
+            if kw in matched or any(kw in m for m in matched)]
 
 
 def fit_lines(text: str, font: str, size: float, max_width: float) -> List[str]:
@@ -195,38 +246,24 @@ def risk_bar(score: float) -> str:
 
 # ---------------- Summary cleaning: drop images ---------------- #
 
-_IMG_TAG_RE = re.compile(r"(?is)<img\b[^>]*>")
-_FIGURE_RE = re.compile(r"(?is)<figure\b[^>]*>.*?</figure>")
-_PICTURE_RE = re.compile(r"(?is)<picture\b[^>]*>.*?</picture>")
-_SVG_RE = re.compile(r"(?is)<svg\b[^>]*>.*?</svg>")
-_IFRAME_RE = re.compile(r"(?is)<iframe\b[^>]*>.*?</iframe>")
-_MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]+\)")
-_DATA_IMAGE_RE = re.compile(r"data:image/[^;]+;base64,[A-Za-z0-9+/=]+")
-
-
-def strip_images_from_html(raw: str) -> str:
-    if not raw:
-        return ""
-    s = raw
-    s = _FIGURE_RE.sub(" ", s)
-    s = _PIICTURE_RE.sub(" ", s) if False else s  # kept harmless; do nothing
-    s = _PICTURE_RE.sub(" ", s)
-    s = _SVG_RE.sub(" ", s)
-    s = _IFRAME_RE.sub(" ", s)
-    s = _IMG_TAG_RE.sub(" ", s)
-    s = _MD_IMAGE_RE.sub(" ", s)
-    s = _DATA_IMAGE_RE.sub(" ", s)
-    return s
+# One alternation covers container elements with their content (figure,
+# picture, svg, iframe, script, style), bare <img> tags, markdown images,
+# inline data: URIs, and any leftover tag — so cleanup is a single scan
+# instead of seven chained re.sub passes, each copying the whole string.
+_STRIP_RE = re.compile(
+    r"(?is)"
+    r"<(figure|picture|svg|iframe|script|style)\b[^>]*>.*?</\1>"
+    r"|<img\b[^>]*>"
+    r"|!\[[^\]]*\]\([^)]+\)"
+    r"|data:image/[^;]+;base64,[A-Za-z0-9+/=]+"
+    r"|<[^>]+>"
+)
 
 
 def strip_html_to_text(raw: str) -> str:
     if not raw:
         return ""
-    s = html.unescape(raw)
-    s = strip_images_from_html(s)
-    s = re.sub(r"(?is)<(script|style).*?>.*?</\1>", " ", s)
-    s = re.sub(r"(?s)<.*?>", " ", s)
-    return normalize_space(s)
+    return normalize_space(_STRIP_RE.sub(" ", html.unescape(raw)))
 
 
 def shorten(s: str, max_chars: int) -> str:
@@ -246,94 +283,150 @@ def wrap_url_smart(c: canvas.Canvas, url: str, font: str, size: float, max_width
     url = (url or "").strip()
     if not url:
         return []
-    c.setFont(font, size)
-
-    lines: List[str] = []
-    cur = ""
-    last_break_pos = -1
 
-    for ch in url:
-        cand = cur + ch
-        if ch in _URL_BREAK_CHARS:
-            last_break_pos = len(cand)
+    # Measure each distinct character once, build a prefix-width array, and
+    # binary-search each break position — O(L) total instead of re-measuring
+    # the growing line per character. Callers set their own font for drawing.
+    widths = {ch: c.stringWidth(ch, font, size) for ch in set(url)}
+    prefix = list(itertools.accumulate(widths[ch] for ch in url))
+    break_ends = [i + 1 for i, ch in enumerate(url) if ch in _URL_BREAK_CHARS]
 
-        if c.stringWidth(cand, font, size) <= max_width:
-            cur = cand
-            continue
-
-        if last_break_pos > 0:
-            lines.append(cur[:last_break_pos].rstrip())
-            cur = cur[last_break_pos:].lstrip() + ch if cur[last_break_pos:].lstrip() else ch
+    lines: List[str] = []
+    start = 0
+    n = len(url)
+
+    while start < n:
+        base = prefix[start - 1] if start else 0.0
+        end = bisect.bisect_right(prefix, base + max_width, lo=start)
+
+        if end >= n:
+            lines.append(url[start:])
+            break
+        if end == start:
+            end = start + 1  # single glyph wider than the line
         else:
-            if cur:
-                lines.append(cur)
-                cur = ch
-            else:
-                lines.append(ch)
-                cur = ""
-
-        last_break_pos = -1
-        for i, cc in enumerate(cur, 1):
-            if cc in _URL_BREAK_CHARS:
-                last_break_pos = i
-
-    if cur:
-        lines.append(cur)
+            # Prefer the last break character in the slice including the
+            # overflowing glyph; breaking right before an overflowing break
+            # character keeps the whole fitting slice on this line.
+            bi = bisect.bisect_right(break_ends, end + 1) - 1
+            if bi >= 0 and break_ends[bi] > start and break_ends[bi] <= end:
+                end = break_ends[bi]
+
+        lines.append(url[start:end].rstrip())
+        start = end
+        while start < n and url[start] == " ":
+            start += 1
+
     return lines
 
 
 def ellipsize_line_to_width(c: canvas.Canvas, text: str, font: str, size: float, max_width: float) -> str:
     text = (text or "")
-    c.setFont(font, size)
     if c.stringWidth(text, font, size) <= max_width:
         return text
     ell = "…"
-    lo, hi = 0, len(text)
-    best = ""
-    while lo <= hi:
-        mid = (lo + hi) // 2
-        cand = text[:mid].rstrip() + ell
-        if c.stringWidth(cand, font, size) <= max_width:
-            best = cand
-            lo = mid + 1
-        else:
-            hi = mid - 1
-    return best or ell
+    ell_w = c.stringWidth(ell, font, size)
+
+    # Prefix-sum the per-character widths once, then bisect for the longest
+    # prefix that still fits with the ellipsis — no O(L) re-measuring per
+    # binary-search probe.
+    prefix = list(itertools.accumulate(c.stringWidth(ch, font, size) for ch in text))
+    cut = bisect.bisect_right(prefix, max_width - ell_w)
+    while cut > 0 and c.stringWidth(text[:cut].rstrip() + ell, font, size) > max_width:
+        cut -= 1
+    return (text[:cut].rstrip() + ell) if cut > 0 else ell
 
 
 # ================= SCORING ================= #
 
-def recency_score(hours_old: float) -> float:
-    midpoint = float(max(1, LOOKBACK_HOURS))
-    spread = max(2.0, midpoint / 4.0)
-    return 30.0 / (1.0 + math.exp((hours_old - midpoint) / spread))
+def article_text_lc(article: Dict) -> str:
+    # The lowercased title+summary is needed by scoring, signals and
+    # classification; collect_and_rank caches it on the article under
+    # "_text_lc" so it is allocated once instead of once per consumer.
+    text = article.get("_text_lc")
+    if text is None:
+        text = (article.get("title", "") + " " + article.get("summary", "")).lower()
+    return text
+
 
+def keyword_score(text: str) -> float:
+    cap = float(MAX_KEYWORD_SCORE)
+    hits = set(keyword_hits(text))
 
-def compute_score(article: Dict) -> float:
-    text = (article["title"] + " " + article.get("summary", "")).lower()
+    total = 0.0
+    if hits:
+        for keyword, weight in _KW_SORTED:
+            if keyword in hits:
+                total += float(weight)
+                if total >= cap:
+                    break
 
-    keyword_score = 0.0
-    for keyword, weight in KEYWORD_WEIGHTS.items():
-        if token_present(text, keyword):
-            keyword_score += float(weight)
+    return min(total, cap)
 
-    score = min(keyword_score, float(MAX_KEYWORD_SCORE))
-    score += float(SOURCE_WEIGHTS.get(article["source"], 10))
 
-    hours_old = (now_utc() - article["published"]).total_seconds() / 3600.0
-    score += max(0.0, recency_score(hours_old))
+def _score_rows(hours, src, kw, midpoint, spread):
+    # The one definition of the per-row score aggregation. NumPy array ops
+    # only, so numba can compile it unchanged and both paths share the
+    # exact same arithmetic.
+    recency = 30.0 / (1.0 + np.exp((hours - midpoint) / spread))
+    return src + np.maximum(0.0, recency) + kw
 
-    return round(score, 1)
 
+# Optional compiled version of the aggregation. Numba is deliberately not a
+# hard dependency: without it the plain _score_rows call gives the same
+# numbers.
+try:
+    from numba import njit
 
-def scoring_signals(article: Dict) -> List[str]:
+    _score_rows_jit = njit(cache=True)(_score_rows)
+except ImportError:
+    _score_rows_jit = None
+
+
+def score_articles(articles: List[Dict], now: Optional[datetime] = None) -> None:
+    """Score all articles in one pass, column-wise.
+
+    The numeric parts (source weight, recency logistic) run through the
+    compiled kernel when numba is installed, or as NumPy array ops
+    otherwise; only the keyword scan stays per-article. Each article gets
+    its "score" set in place.
+    """
+    if not articles:
+        return
+    now = now or now_utc()
+
+    hours = np.array([(now - a["published"]).total_seconds() / 3600.0 for a in articles])
+    midpoint = float(max(1, LOOKBACK_HOURS))
+    spread = max(2.0, midpoint / 4.0)
+
+    src = np.array([float(SOURCE_WEIGHTS.get(a["source"], 10)) for a in articles])
+    kw = np.array([keyword_score(article_text_lc(a)) for a in articles])
+
+    total = None
+    if _score_rows_jit is not None:
+        try:
+            total = _score_rows_jit(hours, src, kw, midpoint, spread)
+        except Exception:
+            # A stale on-disk JIT cache must never kill the run.
+            total = None
+    if total is None:
+        total = _score_rows(hours, src, kw, midpoint, spread)
+
+    scores = np.round(total, 1)
+    for article, score, hours_old in zip(articles, scores, hours):
+        article["score"] = float(score)
+        # Presentation reuses these; compute them here while hours is hot.
+        article["age_hours"] = float(hours_old)
+        article["risk_bar"] = risk_bar(float(score))
+
+
+def scoring_signals(article: Dict, now: Optional[datetime] = None) -> List[str]:
+    now = now or now_utc()
     signals: List[str] = []
-    text = (article["title"] + " " + article.get("summary", "")).lower()
+    text = article_text_lc(article)
 
-    hits: List[str] = []
-    for keyword in KEYWORD_WEIGHTS:
-        if token_present(text, keyword):
-            hits.append("zero-day" if keyword == "zero day" else keyword)
+    hits = ["zero-day" if keyword == "zero day" else keyword
+            for keyword in keyword_hits(text)]
 
     uniq: List[str] = []
     for h in hits:
@@ -345,7 +438,7 @@ def scoring_signals(article: Dict) -> List[str]:
     if SOURCE_WEIGHTS.get(article["source"], 10) >= 20:
         signals.append("trusted source")
 
-    hours_old = (now_utc() - article["published"]).total_seconds() / 3600.0
+    hours_old = (now - article["published"]).total_seconds() / 3600.0
     if hours_old <= 6:
         signals.append("breaking")
     elif hours_old <= 12:
@@ -395,44 +488,149 @@ def extract_summary(entry) -> str:
     return shorten(text, SUMMARY_MAX_CHARS)
 
 
-def is_duplicate_title(title: str, seen_titles: List[str], threshold: float = DUPLICATE_THRESHOLD) -> bool:
-    t = title.lower().strip()
-    return any(SequenceMatcher(None, t, s.lower().strip()).ratio() > threshold for s in seen_titles)
+_TITLE_NORM_RE = re.compile(r"[^a-z0-9 ]")
+
+
+def normalize_title(title: str) -> str:
+    return normalize_space(_TITLE_NORM_RE.sub("", title.lower()))
+
+
+def title_shingles(norm_title: str, k: int = 4) -> frozenset:
+    if len(norm_title) <= k:
+        return frozenset((norm_title,))
+    return frozenset(norm_title[i:i + k] for i in range(len(norm_title) - k + 1))
+
+
+def title_minhash(norm_title: str) -> MinHash:
+    mh = MinHash(num_perm=MINHASH_PERMS)
+    for sh in title_shingles(norm_title):
+        mh.update(sh.encode("utf-8"))
+    return mh
+
+
+def is_duplicate_title(norm_title: str, minhash: MinHash, lsh: MinHashLSH,
+                       threshold: float = DUPLICATE_THRESHOLD) -> bool:
+    # The LSH index returns near-duplicate candidates in sub-linear time, so
+    # dedup no longer scans every previously seen title. Candidates are then
+    # confirmed with a C-implemented Jaro pass, so a MinHash collision
+    # cannot drop a genuinely distinct story. Plain Jaro rather than
+    # Jaro-Winkler: headlines from the same vendor often share a long prefix
+    # ("Microsoft patches ..."), and the Winkler prefix bonus pushes those
+    # distinct stories above any cutoff that still catches real duplicates.
+    # Exact repeats never reach this (they hit the seen_norm set first).
+    for candidate in lsh.query(minhash):
+        if jellyfish.jaro_similarity(norm_title, candidate) > threshold:
+            return True
+    return False
+
+
+# Group order encodes priority: an article mentioning both phishing and
+# ransomware still files under RANSOMWARE, matching the old if-chain.
+_CLASSIFY_RE = re.compile(r"(zero[- ]day|0day|actively exploited)|(ransomware)|(breach)|(phishing)")
+_CLASSIFY_CATEGORIES = ("ZERO-DAYS", "RANSOMWARE", "BREACHES", "PHISHING")
 
 
 def classify(item: Dict) -> str:
-    text = (item.get("title", "") + " " + item.get("summary", "")).lower()
-    if "zero-day" in text or "zero day" in text or "0day" in text or "actively exploited" in text:
-        return "ZERO-DAYS"
-    if "ransomware" in text:
-        return "RANSOMWARE"
-    if "breach" in text or "data breach" in text:
-        return "BREACHES"
-    if "phishing" in text:
-        return "PHISHING"
-    return "OTHER"
+    text = article_text_lc(item)
+    best = 0
+    for match in _CLASSIFY_RE.finditer(text):
+        idx = match.lastindex or 0
+        if idx == 1:
+            return "ZERO-DAYS"
+        if best == 0 or idx < best:
+            best = idx
+    return _CLASSIFY_CATEGORIES[best - 1] if best else "OTHER"
+
+
+FEED_CACHE_PATH = os.path.join(OUT_DIR, "feed_cache.json")
+
+
+def load_feed_cache() -> Dict[str, Dict]:
+    try:
+        with open(FEED_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_feed_cache(cache: Dict[str, Dict]) -> None:
+    os.makedirs(OUT_DIR, exist_ok=True)
+    with open(FEED_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+
+
+def fetch_feed(url: str, cached: Optional[Dict] = None):
+    cached = cached or {}
+    try:
+        # etag/modified turn the fetch into a conditional GET; servers that
+        # support it answer 304 with no body when nothing changed.
+        return feedparser.parse(url, etag=cached.get("etag"), modified=cached.get("modified"))
+    except Exception:
+        return None
+
+
+def fetch_all_feeds() -> List[Tuple[str, List[Dict]]]:
+    # Feed fetching is network-IO bound, so grab them all concurrently;
+    # parsing results are collected back in source order. Each feed's parsed
+    # items are cached alongside its ETag/Last-Modified validators so a 304
+    # response skips both the download and the re-parse.
+    cache = load_feed_cache()
+    sources = list(RSS_FEEDS.keys())
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        feeds = list(pool.map(
+            lambda s: fetch_feed(RSS_FEEDS[s], cache.get(RSS_FEEDS[s])), sources))
+
+    results: List[Tuple[str, List[Dict]]] = []
+    for source, feed in zip(sources, feeds):
+        if feed is None:
+            continue
+        url = RSS_FEEDS[source]
+
+        if getattr(feed, "status", None) == 304:
+            items = [dict(it, published=datetime.fromisoformat(it["published"]))
+                     for it in (cache.get(url) or {}).get("items", [])]
+        else:
+            items = []
+            for entry in getattr(feed, "entries", []):
+                published = parse_entry_datetime(entry)
+                if not published:
+                    continue
+                items.append({
+                    "title": normalize_space(getattr(entry, "title", "")),
+                    "link": canonical_link(getattr(entry, "link", "")),
+                    "summary": extract_summary(entry),
+                    "published": published,
+                })
+            cache[url] = {
+                "etag": getattr(feed, "etag", None),
+                "modified": getattr(feed, "modified", None),
+                "items": [dict(it, published=it["published"].isoformat()) for it in items],
+            }
+
+        results.append((source, items))
+
+    save_feed_cache(cache)
+    return results
 
 
 def collect_and_rank() -> List[Dict]:
-    cutoff = now_utc() - timedelta(hours=LOOKBACK_HOURS)
+    now = now_utc()
+    cutoff = now - timedelta(hours=LOOKBACK_HOURS)
 
     articles: List[Dict] = []
-    seen_titles: List[str] = []
+    seen_norm: set[str] = set()
+    lsh = MinHashLSH(threshold=LSH_CANDIDATE_THRESHOLD, num_perm=MINHASH_PERMS)
     seen_links: set[str] = set()
 
-    for source, url in RSS_FEEDS.items():
-        try:
-            feed = feedparser.parse(url)
-        except Exception:
-            continue
-
-        for entry in getattr(feed, "entries", []):
-            published = parse_entry_datetime(entry)
-            if not published or published < cutoff:
+    for source, items in fetch_all_feeds():
+        for item in items:
+            published = item["published"]
+            if published < cutoff:
                 continue
 
-            title = normalize_space(getattr(entry, "title", ""))
-            link = canonical_link(getattr(entry, "link", ""))
+            title = item["title"]
+            link = item["link"]
 
             if not title:
                 continue
@@ -442,38 +640,49 @@ def collect_and_rank() -> List[Dict]:
                     continue
                 seen_links.add(link)
 
-            if is_duplicate_title(title, seen_titles, DUPLICATE_THRESHOLD):
+            norm = normalize_title(title)
+            if norm in seen_norm:
+                continue
+            minhash = title_minhash(norm)
+            if is_duplicate_title(norm, minhash, lsh, DUPLICATE_THRESHOLD):
                 continue
-            seen_titles.append(title)
+            seen_norm.add(norm)
+            lsh.insert(norm, minhash)
 
             article = {
                 "title": safe_text(title),
-                "summary": safe_text(extract_summary(entry)),
+                "summary": safe_text(item["summary"]),
                 "source": source,
                 "published": published,
                 "link": link,
             }
-            article["score"] = compute_score(article)
-            if SHOW_SIGNALS:
-                article["signals"] = scoring_signals(article)
+            article["_text_lc"] = (article["title"] + " " + article["summary"]).lower()
+            article["category"] = classify(article)
             articles.append(article)
 
+    score_articles(articles, now=now)
+    for article in articles:
+        if SHOW_SIGNALS:
+            article["signals"] = scoring_signals(article, now=now)
+        del article["_text_lc"]
+
     articles.sort(key=lambda x: x["score"], reverse=True)
     return articles[:TOP_N]
 
 
 # ================= WHATSAPP TEXT HELPERS ================= #
 
-def build_text_digest(news: List[Dict]) -> str:
+def build_text_digest(news: List[Dict], now: Optional[datetime] = None) -> str:
     if not news:
         return f"Cybersecurity Briefing • Top {TOP_N} ({LOOKBACK_HOURS}h)\n\nNo qualifying items found."
 
+    now = now or now_utc()
     header = f"Cybersecurity Briefing • Top {min(TOP_N, len(news))} ({LOOKBACK_HOURS}h)\n\n"
     lines: List[str] = [header]
 
     for i, n in enumerate(news[:TOP_N], 1):
-        hours_old = (now_utc() - n["published"]).total_seconds() / 3600.0
-        bar = risk_bar(float(n.get("score", 0.0)))
+        hours_old = n["age_hours"] if "age_hours" in n else (now - n["published"]).total_seconds() / 3600.0
+        bar = n.get("risk_bar") or risk_bar(float(n.get("score", 0.0)))
         lines.append(f"{i}. {n.get('title','').strip()}")
         lines.append(f"{n.get('source','')} • {bar} {n.get('score','')} • {hours_old:.1f}h")
         summ = (n.get("summary") or "").strip()
@@ -532,9 +741,15 @@ def prefix_parts(chunks: List[str]) -> List[str]:
 
 # ================= PDF ================= #
 
-def build_pdf_bytes(news: List[Dict]) -> bytes:
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=landscape(LETTER))
+def build_pdf(news: List[Dict], fileobj, now: Optional[datetime] = None) -> None:
+    # Writes the finished PDF straight into fileobj (an open binary file or
+    # buffer), so no second in-memory copy of the document is ever built.
+    now = now or now_utc()
+    c = canvas.Canvas(fileobj, pagesize=landscape(LETTER))
+    # Compressed content streams shrink the file for disk and the WhatsApp
+    # media upload; we only use the built-in Type1 Times faces, so nothing
+    # is embedded that compression could bloat.
+    c.setPageCompression(1)
     width, height = landscape(LETTER)
 
     margin = 0.55 * inch
@@ -550,6 +765,11 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
 
     page_num = 1
 
+    # Counted once; every sidebar repaint reuses it.
+    pulse = {"ZERO-DAYS": 0, "RANSOMWARE": 0, "BREACHES": 0, "PHISHING": 0, "OTHER": 0}
+    for item in news:
+        pulse[item.get("category") or classify(item)] += 1
+
     def draw_page_number(pn: int):
         c.setFont("Times-Roman", 9)
         c.setFillColor(colors.grey)
@@ -576,18 +796,15 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
         c.drawString(x + 0.18 * inch, y - 0.78 * inch, "NEWSLETTER")
 
         c.setFont("Times-Roman", 9.5)
-        dt = now_utc().strftime("%A, %b %d, %Y • %H:%M UTC")
+        dt = now.strftime("%A, %b %d, %Y • %H:%M UTC")
         c.drawString(x + 0.18 * inch, y - 1.10 * inch, dt)
 
         c.setStrokeColor(SIDEBAR_RULE)
         c.setLineWidth(0.6)
         c.line(x + 0.18 * inch, y - 1.25 * inch, x + sidebar_w - 0.18 * inch, y - 1.25 * inch)
 
-        pulse = {"ZERO-DAYS": 0, "RANSOMWARE": 0, "BREACHES": 0, "PHISHING": 0, "OTHER": 0}
-        for it in items:
-            pulse[classify(it)] += 1
-
-        c.setFillColor(SIDEBAR_TEXT)
+        # Fill stays SIDEBAR_TEXT and stroke SIDEBAR_RULE for the rest of the
+        # panel; only change graphics state when it actually differs.
         c.setFont("Times-Bold", 10)
         c.drawString(x + 0.18 * inch, y - 1.52 * inch, "THREAT PULSE")
 
@@ -597,12 +814,9 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
             c.drawString(x + 0.18 * inch, yy, f"{k.title():<12}  {pulse[k]}")
             yy -= 0.18 * inch
 
-        c.setStrokeColor(SIDEBAR_RULE)
-        c.setLineWidth(0.6)
         c.line(x + 0.18 * inch, yy - 0.08 * inch, x + sidebar_w - 0.18 * inch, yy - 0.08 * inch)
 
         yy -= 0.30 * inch
-        c.setFillColor(SIDEBAR_TEXT)
         c.setFont("Times-Bold", 10)
         c.drawString(x + 0.18 * inch, yy, f"TOP {min(TOP_N, len(items))}")
         yy -= 0.22 * inch
@@ -626,7 +840,6 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
                 break
 
         c.setFont("Times-Roman", 8.2)
-        c.setFillColor(SIDEBAR_TEXT)
         c.drawString(x + 0.18 * inch, bottom + 0.25 * inch, f"Lookback: {LOOKBACK_HOURS}h • Ranked by risk")
         c.setFillColor(colors.black)
         c.setStrokeColor(colors.black)
@@ -684,19 +897,15 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
         tx = x + inner_pad
         ty = y_top - 12
 
+        # Draw in fill-color groups (black, then BLUE_TEXT, then grey) so
+        # each card emits at most three color operators instead of toggling
+        # per text block; draw_rect above already left the fill black.
         c.setFont("Times-Bold", 11)
-        c.setFillColor(colors.black)
         for line in hl[:2]:
             c.drawString(tx, ty, line)
             ty -= lh_head
 
-        hours_old = (now_utc() - item["published"]).total_seconds() / 3600.0
-        bar = risk_bar(item["score"])
-        meta = f"{item['source']} • {bar} {item['score']} • {hours_old:.1f}h"
-        c.setFont("Times-Roman", 8.5)
-        c.setFillColor(BLUE_TEXT)
-        c.drawString(tx, ty, meta)
-        c.setFillColor(colors.black)
+        meta_y = ty
         ty -= lh_meta
 
         if summ:
@@ -705,26 +914,33 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
                 c.drawString(tx, ty, line)
                 ty -= lh_sum
 
-        if has_kicker:
-            sigs = item["signals"][:2]
-            kicker = f"Why it matters: {', '.join(sigs)}."
-            c.setFont("Times-Italic", 8.2)
-            c.setFillColor(colors.grey)
-            kline = fit_lines(kicker, "Times-Italic", 8.2, max_w)
-            if kline:
-                c.drawString(tx, ty, kline[0])
-                ty -= lh_kick
-            c.setFillColor(colors.black)
-
-        if has_link and link_lines:
-            c.setFont("Times-Roman", 7.2)
+        hours_old = item["age_hours"] if "age_hours" in item else (now - item["published"]).total_seconds() / 3600.0
+        bar = item.get("risk_bar") or risk_bar(item["score"])
+        c.setFont("Times-Roman", 8.5)
+        c.setFillColor(BLUE_TEXT)
+        c.drawString(tx, meta_y, f"{item['source']} • {bar} {item['score']} • {hours_old:.1f}h")
+
+        if has_kicker or (has_link and link_lines):
             c.setFillColor(colors.grey)
-            for line in link_lines:
-                c.drawString(tx, ty, line)
-                tw = c.stringWidth(line, "Times-Roman", 7.2)
-                c.linkURL(url, (tx, ty - 2, tx + tw, ty + 9), relative=0)
-                ty -= lh_link
-            c.setFillColor(colors.black)
+
+            if has_kicker:
+                sigs = item["signals"][:2]
+                kicker = f"Why it matters: {', '.join(sigs)}."
+                c.setFont("Times-Italic", 8.2)
+                kline = fit_lines(kicker, "Times-Italic", 8.2, max_w)
+                if kline:
+                    c.drawString(tx, ty, kline[0])
+                    ty -= lh_kick
+
+            if has_link and link_lines:
+                c.setFont("Times-Roman", 7.2)
+                for line in link_lines:
+                    c.drawString(tx, ty, line)
+                    tw = c.stringWidth(line, "Times-Roman", 7.2)
+                    c.linkURL(url, (tx, ty - 2, tx + tw, ty + 9), relative=0)
+                    ty -= lh_link
+
+        c.setFillColor(colors.black)
 
         return y_top - card_h - 0.16 * inch
 
@@ -735,14 +951,14 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
         c.drawString(content_x, top - 0.6 * inch, "No qualifying items found.")
         c.showPage()
         c.save()
-        return buf.getvalue()
+        return
 
     draw_sidebar(news)
 
     sections_order = ["ZERO-DAYS", "RANSOMWARE", "BREACHES", "PHISHING", "OTHER"]
     grouped: Dict[str, List[Dict]] = {k: [] for k in sections_order}
     for item in news:
-        grouped[classify(item)].append(item)
+        grouped[item.get("category") or classify(item)].append(item)
 
     items: List[Tuple[str, Dict]] = []
     for sec in sections_order:
@@ -784,20 +1000,26 @@ def build_pdf_bytes(news: List[Dict]) -> bytes:
 
     c.showPage()
     c.save()
-    return buf.getvalue()
 
 
-def write_pdf_to_disk(pdf_bytes: bytes) -> str:
+def write_pdf_to_disk(news: List[Dict], now: Optional[datetime] = None) -> str:
+    now = now or now_utc()
     os.makedirs(OUT_DIR, exist_ok=True)
-    fname = f"cyber_newsletter-{now_utc().strftime('%Y%m%d-%H%M')}.pdf"
+    fname = f"cyber_newsletter-{now.strftime('%Y%m%d-%H%M')}.pdf"
     path = os.path.join(OUT_DIR, fname)
     with open(path, "wb") as f:
-        f.write(pdf_bytes)
+        build_pdf(news, f, now=now)
     return path
 
 
 # ================= WHATSAPP SEND (optional) ================= #
 
+# One session so multi-chunk digests reuse the TCP+TLS connection instead of
+# paying a fresh handshake per message.
+_twilio_session = requests.Session()
+_twilio_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
 def validate_twilio_config() -> None:
     missing = [k for k, v in {
         "TWILIO_ACCOUNT_SID": ACCOUNT_SID,
@@ -821,7 +1043,12 @@ def twilio_send_message(body: str, media_url: Optional[str] = None) -> None:
         if not media_url.startswith("https://"):
             raise ValueError("media_url must be a public HTTPS URL.")
         data["MediaUrl"] = media_url
-    r = requests.post(url, data=data, auth=(ACCOUNT_SID, AUTH_TOKEN), timeout=30)
+    for attempt in range(3):
+        r = _twilio_session.post(url, data=data, auth=(ACCOUNT_SID, AUTH_TOKEN), timeout=30)
+        if r.status_code != 429:
+            break
+        # Only back off when Twilio actually throttles us.
+        time.sleep(float(r.headers.get("Retry-After", 2 ** attempt)))
     if r.status_code >= 400:
         raise RuntimeError(f"Twilio API error {r.status_code}: {r.text}")
 
@@ -846,8 +1073,7 @@ def main() -> None:
     news = collect_and_rank()
     print(f"Collected {len(news)} articles (TOP_N={TOP_N}, LOOKBACK_HOURS={LOOKBACK_HOURS})")
 
-    pdf_bytes = build_pdf_bytes(news)
-    pdf_path = write_pdf_to_disk(pdf_bytes)
+    pdf_path = write_pdf_to_disk(news)
     print(f"PDF generated: {pdf_path}")
 
     # Optional: send text digest
@@ -855,7 +1081,6 @@ def main() -> None:
         digest = build_text_digest(news)
         for part in prefix_parts(chunk_text(digest, max_len=WHATSAPP_MAX_LEN)):
             twilio_send_message(part)
-            time.sleep(1)
         print("WhatsApp text digest sent.")
 
     # Optional: send the PDF as WhatsApp media